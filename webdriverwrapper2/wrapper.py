@@ -1,16 +1,188 @@
 import logging
+import pkgutil
+import select
+import sys
+import time
+from functools import cached_property, lru_cache
 from urllib.parse import urlparse, urlunparse, urlencode
 
-from selenium.webdriver import *
+from selenium.webdriver import Chrome as _Chrome
 import selenium.common.exceptions as selenium_exc
 from selenium.webdriver.common.alert import Alert
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions
 from selenium.webdriver.support.ui import WebDriverWait
 
 logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(levelname)s : %(message)s')
 
 
+# Strategies in the same order as locator arguments of `_resolve_locator`.
+_LOCATOR_STRATEGIES = (By.ID, By.CLASS_NAME, By.NAME, By.TAG_NAME, By.XPATH, By.CSS_SELECTOR)
+
+
+@lru_cache(maxsize=128)
+def _resolve_locator(id_=None, class_name=None, name=None, tag_name=None, xpath=None, css_selector=None):
+    """
+    Translates wrapper's locator arguments to ``(by, value)`` pair for
+    ``find_element*`` methods.
+    """
+    by = value = None
+    for strategy, x in zip(_LOCATOR_STRATEGIES, (id_, class_name, name, tag_name, xpath, css_selector)):
+        if x is not None:
+            if by is not None:
+                raise Exception('You can find element only by one param.')
+            by, value = strategy, x
+    if by is None:
+        raise Exception('You must specify id or name of element on which you want to click.')
+    return by, value
+
+
+def _css_string(value):
+    return '"%s"' % value.replace('\\', '\\\\').replace('"', '\\"')
+
+
+def _to_css_selector(by, value):
+    """
+    Converts ``(by, value)`` pair to CSS selector the same way as Selenium
+    does it. Returns ``None`` when it's not possible.
+    """
+    if by == By.ID:
+        return '[id=%s]' % _css_string(value)
+    if by == By.CLASS_NAME:
+        return '.%s' % value
+    if by == By.NAME:
+        return '[name=%s]' % _css_string(value)
+    if by == By.TAG_NAME:
+        return value
+    if by == By.CSS_SELECTOR:
+        return value
+    return None
+
+
+# Child locators which can be prefixed by parent selector in `_fuse_locator`.
+_FUSABLE_STRATEGIES = (By.ID, By.CLASS_NAME, By.NAME, By.TAG_NAME)
+
+
+@lru_cache(maxsize=128)
+def _fuse_locator(parent_locator, locator):
+    """
+    Returns ``(By.CSS_SELECTOR, selector)`` finding child element inside of
+    parent by one request, or ``None`` when locators can't be fused. Only
+    parent found by ID is fused, other parent locators can match more
+    elements but child is searched only in the first one. Child CSS selector
+    isn't fused either, because in element it's matched against whole
+    document and then limited to descendants (``nav a`` or ``:scope > li``
+    would match something else after prefixing with parent).
+    """
+    parent_id, parent_class_name, parent_name, parent_tag_name = parent_locator
+    if not parent_id or parent_class_name or parent_name or parent_tag_name:
+        return None
+    by, value = _resolve_locator(*locator)
+    if by not in _FUSABLE_STRATEGIES:
+        return None
+    return By.CSS_SELECTOR, '%s %s' % (_to_css_selector(By.ID, parent_id), _to_css_selector(by, value))
+
+
+def _split_locator(id_=None, class_name=None, name=None, tag_name=None,
+                   parent_id=None, parent_class_name=None, parent_name=None, parent_tag_name=None,
+                   xpath=None, css_selector=None):
+    """
+    Splits arguments of :py:meth: `~._WebdriverBaseWrapper.get_elms` to
+    parent and child locators.
+    """
+    return (
+        (parent_id, parent_class_name, parent_name, parent_tag_name),
+        (id_, class_name, name, tag_name, xpath, css_selector),
+    )
+
+
+def _single_locator(parent_locator, locator):
+    """
+    Returns ``(by, value)`` finding element from driver by one request, or
+    ``None`` when parent element has to be found first.
+    """
+    if any(parent_locator):
+        return _fuse_locator(parent_locator, locator)
+    return _resolve_locator(*locator)
+
+
+def _locator_to_css_selector(*args, **kwargs):
+    """
+    Returns one CSS selector for arguments of
+    :py:meth: `~._WebdriverBaseWrapper.get_elms`, or ``None`` when locator
+    can't be expressed by CSS.
+    """
+    single = _single_locator(*_split_locator(*args, **kwargs))
+    return _to_css_selector(*single) if single else None
+
+
+@lru_cache(maxsize=None)
+def _visibility_script(script):
+    """
+    Prepends function ``isVisible(element)`` to ``script``. It's Selenium's
+    isDisplayed atom, the same one used by
+    :py:meth: `~selenium.webdriver.remote.webelement.WebElement.is_displayed`.
+    """
+    is_displayed_js = pkgutil.get_data('selenium.webdriver.remote', 'isDisplayed.js').decode('utf8')
+    return 'const isVisible = (%s);\n%s' % (is_displayed_js, script)
+
+
+# Returns first visible element of passed ones, or null.
+_FIRST_VISIBLE_JS = """
+return arguments[0].find(e => isVisible(e)) || null;
+"""
+
+# Seconds of one in-page wait of `_WAIT_VISIBLE_JS`. Kept short so it fits
+# into script timeout of session and page navigation is noticed soon.
+_WAIT_VISIBLE_SLICE = 1
+
+# Resolves with first visible element (or true when waiting for hiding) as
+# soon as DOM changes to expected state, or with null after timeout. Invalid
+# selector resolves with object {invalidSelector: message}. Interval check
+# covers changes not visible to MutationObserver, like loaded styles.
+_WAIT_VISIBLE_JS = """
+const [cssSelector, wantVisible, timeout, done] = arguments;
+const observer = new MutationObserver(check);
+const interval = setInterval(check, 100);
+const timer = setTimeout(() => finish(null), timeout);
+function finish(result) {
+    observer.disconnect();
+    clearInterval(interval);
+    clearTimeout(timer);
+    done(result);
+}
+function check() {
+    let elms;
+    try {
+        elms = document.querySelectorAll(cssSelector);
+    } catch (error) {
+        return finish({invalidSelector: error.message});
+    }
+    const elm = Array.from(elms).find(e => isVisible(e));
+    if (wantVisible ? elm : !elm) {
+        finish(elm || true);
+    }
+}
+observer.observe(document.documentElement, {
+    subtree: true, childList: true, attributes: true, attributeFilter: ['style', 'class', 'hidden'],
+});
+check();
+"""
+
+
+class _DriverCache:
+    """
+    Objects reused by wrapper during life of one driver. Kept together so
+    they take only one entry in driver's ``__dict__``.
+    """
+    __slots__ = ('wait_cache', 'alert')
+
+    def __init__(self):
+        self.wait_cache = {}
+        self.alert = None
+
+
 class _WebdriverBaseWrapper:
     default_wait_timeout = 10
     """
@@ -38,17 +210,18 @@ class _WebdriverBaseWrapper:
                 parent_id=None, parent_class_name=None, parent_name=None, parent_tag_name=None,
                 xpath=None, css_selector=None):
         """
-        Returns first found element. This method uses
-        :py:meth: `~._WebdriverBaseWrapper.get_elms`.
+        Returns first found element. Accepts same arguments as
+        :py:meth: `~._WebdriverBaseWrapper.get_elms`. When parent element
+        gets stale during the lookup, it's found again once more.
         """
-        elms = self.get_elms(
-            id_, class_name, name, tag_name,
-            parent_id, parent_class_name, parent_name, parent_tag_name,
-            xpath, css_selector
-        )
-        if not elms:
-            raise selenium_exc.NoSuchElementException()
-        return elms[0]
+        parent_locator = (parent_id, parent_class_name, parent_name, parent_tag_name)
+        locator = (id_, class_name, name, tag_name, xpath, css_selector)
+        parent, by, value = self._locate(parent_locator, locator)
+        try:
+            return parent.find_element(by=by, value=value)
+        except selenium_exc.StaleElementReferenceException:
+            parent, by, value = self._locate(parent_locator, locator)
+            return parent.find_element(by=by, value=value)
 
     def get_elms(self,
                  id_=None, class_name=None, name=None, tag_name=None,
@@ -66,28 +239,33 @@ class _WebdriverBaseWrapper:
             # vs.
 
             elm = driver.get_elms(parent_id='someid', class_name='someclass')
+
+        When parent element doesn't exist, empty list is returned. Child is
+        searched only in first found parent element, except parent specified
+        by ``parent_id`` with child by ``id_``, ``class_name``, ``name`` or
+        ``tag_name``. Those are found by one request with CSS selector
+        ``[id="someid"] .someclass``, which searches in all elements with
+        that ID (page with valid HTML has only one).
         """
-        if parent_id or parent_class_name or parent_name or parent_tag_name:
-            parent = self.get_elm(parent_id, parent_class_name, parent_name, parent_tag_name)
-        else:
-            parent = self
-
-        if len([x for x in (id_, class_name, name, tag_name, xpath, css_selector) if x is not None]) > 1:
-            raise Exception('You can find element only by one param.')
-
-        if id_ is not None:
-            return parent.find_elements(by=By.ID, value=id_)
-        if class_name is not None:
-            return parent.find_elements(by=By.CLASS_NAME, value=class_name)
-        if name is not None:
-            return parent.find_elements(by=By.NAME, value=name)
-        if tag_name is not None:
-            return parent.find_elements(by=By.TAG_NAME, value=tag_name)
-        if xpath is not None:
-            return parent.find_elements(by=By.XPATH, value=xpath)
-        if css_selector is not None:
-            return parent.find_elements(by=By.CSS_SELECTOR, value=css_selector)
-        raise Exception('You must specify id or name of element on which you want to click.')
+        try:
+            parent, by, value = self._locate(
+                (parent_id, parent_class_name, parent_name, parent_tag_name),
+                (id_, class_name, name, tag_name, xpath, css_selector)
+            )
+        except selenium_exc.NoSuchElementException:
+            return []
+        return parent.find_elements(by=by, value=value)
+
+    def _locate(self, parent_locator, locator):
+        """
+        Returns ``(parent, by, value)`` for ``find_element*`` methods. When
+        it's possible, parent and child locators are fused into one CSS
+        selector so no extra request for parent element is needed.
+        """
+        single = _single_locator(parent_locator, locator)
+        if single:
+            return (self,) + single
+        return (self.get_elm(*parent_locator),) + _resolve_locator(*locator)
 
     def wait_for_element(self, timeout=None, message='', *args, **kwargs):
         """
@@ -98,12 +276,20 @@ class _WebdriverBaseWrapper:
         ... code-block:: python
             selenium.webdriver.support.wait.WebDriverWait(driver, timeout).until(lambda driver: driver.get_elm(...))
         """
-        if not timeout:
-            timeout = self.default_wait_timeout
-        self.wait(timeout).until(lambda driver: driver.get_elm(*args, **kwargs), message=message)
-
-        elm = self.get_elm(*args, **kwargs)
-        return elm
+        single = _single_locator(*_split_locator(*args, **kwargs))
+        if single:
+            condition = expected_conditions.presence_of_element_located(single)
+            return self.wait(timeout).until(condition, message=message)
+        found = None
+        def callback(driver):
+            nonlocal found
+            elms = self.get_elms(*args, **kwargs)
+            if not elms:
+                return False
+            found = elms[0]
+            return True
+        self.wait(timeout).until(callback, message=message)
+        return found
 
     def wait_for_element_show(self, timeout=None, message='', *args, **kwargs):
         """
@@ -114,21 +300,23 @@ class _WebdriverBaseWrapper:
         ... code-block:: python
             selenium.webdriver.support.wait.WebDriverWait(driver, timeout).until(lambda driver: driver.get_elm(...))
         """
-        if not timeout:
-            timeout = self.default_wait_timeout
+        timeout = self._get_timeout(timeout)
+        css_selector = _locator_to_css_selector(*args, **kwargs)
+        if css_selector is not None:
+            return self._wait_visible_js(css_selector, timeout, message)
+        found = None
         def callback(driver):
+            nonlocal found
             elms = self.get_elms(*args, **kwargs)
             if not elms:
                 return False
             try:
-                if all(not elm.is_displayed() for elm in elms):
-                    return False
+                found = self._first_visible(elms)
             except selenium_exc.StaleElementReferenceException:
                 return False
-            return True
+            return found is not None
         self.wait(timeout).until(callback, message=message)
-        elm = self.get_elm(*args, **kwargs)
-        return elm
+        return found
 
     def wait_for_element_hide(self, timeout=None, message='', *args, **kwargs):
         """
@@ -138,20 +326,62 @@ class _WebdriverBaseWrapper:
         ... code-block:: python
             selenium.webdriver.support.wait.WebDriverWait(driver, timeout).until(lambda driver: not driver.get_elm(...))
         """
-        if not timeout:
-            timeout = self.default_wait_timeout
+        timeout = self._get_timeout(timeout)
+        css_selector = _locator_to_css_selector(*args, **kwargs)
+        if css_selector is not None:
+            self._wait_visible_js(css_selector, timeout, message, want_visible=False)
+            return
         def callback(driver):
             elms = self.get_elms(*args, **kwargs)
             if not elms:
                 return True
             try:
-                if all(not elm.is_displayed() for elm in elms):
+                if self._first_visible(elms) is None:
                     return True
             except selenium_exc.StaleElementReferenceException:
                 return False
             return False
         self.wait(timeout).until(callback, message=message)
 
+    def _get_timeout(self, timeout):
+        # Only None means default, so timeout 0 can be used as well.
+        return self.default_wait_timeout if timeout is None else timeout
+
+    def _first_visible(self, elms):
+        """
+        Returns first visible element from ``elms`` or ``None``. Visibility
+        of all elements is checked by one request.
+        """
+        return self.execute_script(_visibility_script(_FIRST_VISIBLE_JS), elms)
+
+    def _wait_visible_js(self, css_selector, timeout, message='', want_visible=True):
+        """
+        Waits in page until some element matching ``css_selector`` is visible
+        (or until none is visible when ``want_visible`` is ``False``). Each
+        poll of :py:meth: `~._WebdriverBaseWrapper.wait` waits in page by
+        async script for up to `_WAIT_VISIBLE_SLICE` seconds, so change is
+        noticed right away without polling every element from Python.
+        Returns found element when waiting for visible one.
+        """
+        end_time = time.monotonic() + timeout
+        def callback(driver):
+            slice_timeout = min(max(end_time - time.monotonic(), 0), _WAIT_VISIBLE_SLICE)
+            try:
+                result = self.execute_async_script(
+                    _visibility_script(_WAIT_VISIBLE_JS), css_selector, want_visible, int(slice_timeout * 1000))
+            except selenium_exc.ScriptTimeoutException:
+                # Script timeout of session is shorter than the slice.
+                return None
+            except selenium_exc.JavascriptException as exc:
+                # Page was unloaded during the wait, try it again on new one.
+                if 'document unloaded' in (exc.msg or ''):
+                    return None
+                raise
+            if isinstance(result, dict) and 'invalidSelector' in result:
+                raise selenium_exc.InvalidSelectorException(result['invalidSelector'])
+            return result
+        return self.wait(timeout).until(callback, message=message)
+
     def wait(self, timeout=None):
         """
         Call following snippet, so you don't have to remember what import. See
@@ -167,9 +397,16 @@ class _WebdriverBaseWrapper:
             driver.wait().until(lambda driver: len(driver.find_element_by_id('elm')) > 10)
 
         """
-        if not timeout:
-            timeout = self.default_wait_timeout
-        return WebDriverWait(self, timeout)
+        timeout = self._get_timeout(timeout)
+        wait_cache = self._cache.wait_cache
+        wait = wait_cache.get(timeout)
+        if wait is None:
+            wait = wait_cache[timeout] = WebDriverWait(self, timeout)
+        return wait
+
+    @cached_property
+    def _cache(self):
+        return _DriverCache()
 
 
 class _WebdriverWrapper(_WebdriverBaseWrapper):
@@ -189,34 +426,70 @@ class _WebdriverWrapper(_WebdriverBaseWrapper):
         """
         Returns ``innerHTML`` of whole page. On page have to be tag ``body``.
         """
-        try:
-            body = self.get_elm(tag_name='body')
-        except selenium_exc.NoSuchElementException:
-            return None
-        else:
-            return body.get_attribute('innerHTML')
+        return self.execute_script('return document.body && document.body.innerHTML;')
+
+    def get_elms_js(self, css_selector, attrs):
+        """
+        Returns values of ``attrs`` for all elements matching ``css_selector``
+        by one request, without transferring elements themselves. For every
+        element there is list of values in same order as ``attrs``. Values
+        are HTML attributes, only ``innerHTML`` and ``textContent`` are read
+        as DOM properties. Single attribute can be passed as string.
+
+        ... code-block:: python
+
+            links = driver.get_elms_js('a.item', ['href', 'textContent'])
+        """
+        if isinstance(attrs, str):
+            attrs = [attrs]
+        return self.execute_script(
+            'const attrs = arguments[1];'
+            'const properties = ["innerHTML", "textContent"];'
+            'return Array.from(document.querySelectorAll(arguments[0]),'
+            '    e => attrs.map(k => properties.includes(k) ? e[k] : e.getAttribute(k)));',
+            css_selector, list(attrs)
+        )
 
     def break_point(self):
         """
         Stops testing and wait for pressing enter to continue.
 
         Useful when you need check Chrome console for some info for example.
+        While waiting, browser session is kept alive so it doesn't time out.
         """
         logging.info('Break point. Type enter to continue.')
-        input()
+        if sys.platform == 'win32':
+            # select works only with sockets on Windows.
+            input()
+            return
+        while True:
+            ready, _, _ = select.select([sys.stdin], [], [], 5)
+            if ready:
+                sys.stdin.readline()
+                return
+            try:
+                self.execute_script('return 1;')
+            except selenium_exc.WebDriverException:
+                pass
 
     def get_url(self, path=None, query=None):
+        if path and path.startswith(('http://', 'https://', '//')):
+            return path
         if urlparse(path).netloc:
             return path
 
+        url_parts = urlparse(self.current_url)
+        path = path or url_parts.path
+        if not query and url_parts.netloc and path.startswith('/'):
+            return '%s://%s%s' % (url_parts.scheme, url_parts.netloc, path)
+
         if isinstance(query, dict):
             query = urlencode(query)
 
-        url_parts = urlparse(self.current_url)
         new_url_parts = (
             url_parts.scheme,
             url_parts.netloc,
-            path or url_parts.path,
+            path,
             None, # params
             query,
             None # fragment
@@ -225,12 +498,17 @@ class _WebdriverWrapper(_WebdriverBaseWrapper):
 
         return url
 
-    def switch_to_window(self, window_name=None, title=None, url=None):
+    def switch_to_window(self, window_name=None, title=None, url=None, handle=None):
         """
         WebDriver implements switching to other window only by it's name. With
         wrapper there is also option to switch by title of window or URL. URL
-        can be also relative path.
+        can be also relative path. When you already have window handle, pass
+        it as ``handle``.
         """
+        if handle:
+            self.switch_to.window(handle)
+            return
+
         if window_name:
             self.switch_to.window(window_name)
             return
@@ -254,7 +532,7 @@ class _WebdriverWrapper(_WebdriverBaseWrapper):
         main_window_handle = self.current_window_handle
         self.switch_to_window(window_name, title, url)
         self.close()
-        self.switch_to_window(main_window_handle)
+        self.switch_to_window(handle=main_window_handle)
 
     def close_other_windows(self):
         """
@@ -265,9 +543,9 @@ class _WebdriverWrapper(_WebdriverBaseWrapper):
         for window_handle in self.window_handles:
             if window_handle == main_window_handle:
                 continue
-            self.switch_to_window(window_handle)
+            self.switch_to_window(handle=window_handle)
             self.close()
-        self.switch_to_window(main_window_handle)
+        self.switch_to_window(handle=main_window_handle)
 
     def close_alert(self, ignore_exception=False):
         """
@@ -276,39 +554,83 @@ class _WebdriverWrapper(_WebdriverBaseWrapper):
         ``ignore_exception`` setted to ``True`` which will ignore any exception.
         """
         try:
-            alert = self.get_alert()
-            alert.accept()
+            self.get_alert().accept()
         except:
             if not ignore_exception:
                 raise
 
+    def _alert_present(self):
+        try:
+            self.get_alert().text
+        except selenium_exc.NoAlertPresentException:
+            return False
+        return True
+
     def get_alert(self):
         """
         Returns instance of :py:obj:`~selenium.webdriver.common.alert.Alert`.
         """
-        return Alert(self)
+        cache = self._cache
+        if cache.alert is None:
+            # Alert holds only reference to driver, so it can be reused.
+            cache.alert = Alert(self)
+        return cache.alert
 
     def wait_for_alert(self, timeout=None):
         """
         Shortcut for waiting for alert. If it not ends with exception, it
         returns that alert. Detault timeout is `~.default_wait_timeout`.
         """
-        if not timeout:
-            timeout = self.default_wait_timeout
-
-        alert = Alert(self)
-
-        def alert_shown(driver):
-            try:
-                alert.text
-                return True
-            except selenium_exc.NoAlertPresentException:
-                return False
+        self.wait(timeout).until(lambda driver: driver._alert_present())
+        return self.get_alert()
 
-        self.wait(timeout).until(alert_shown)
-
-        return alert
 
+class Chrome(_WebdriverWrapper, _Chrome):
+    def switch_to_window(self, window_name=None, title=None, url=None, handle=None):
+        """
+        Same as :py:meth: `~._WebdriverWrapper.switch_to_window`, but window
+        by title or URL is first searched in CDP targets, which returns them
+        all by one request. When more windows match, the first one in
+        ``window_handles`` is used, same as without CDP. When it's not found
+        there, it falls back to switching through all windows.
+        """
+        if not (window_name or handle) and (title or url):
+            if url:
+                url = self.get_url(path=url)
+            target_handle = self._find_window_handle_by_cdp(title, url)
+            if target_handle:
+                try:
+                    super().switch_to_window(handle=target_handle)
+                    return
+                except selenium_exc.NoSuchWindowException:
+                    pass
+        super().switch_to_window(window_name, title, url, handle)
 
-class Chrome(_WebdriverWrapper, Chrome):
-    pass
\ No newline at end of file
+    def _find_window_handle_by_cdp(self, title=None, url=None):
+        try:
+            targets = self.execute_cdp_cmd('Target.getTargets', {})['targetInfos']
+        except selenium_exc.WebDriverException:
+            return None
+        matching_ids = {
+            target['targetId'] for target in targets
+            if target['type'] == 'page' and (
+                (title and target['title'] == title) or (url and target['url'] == url)
+            )
+        }
+        if not matching_ids:
+            return None
+        # Same window as generic loop would pick when more of them match.
+        return next((handle for handle in self.window_handles if handle in matching_ids), None)
+
+
+def __getattr__(name):
+    # Keeps names from ``selenium.webdriver`` accessible from this module as
+    # they were with former star import. Dunder names (``__path__``,
+    # ``__all__``, ...) belong to this module and mustn't be taken from there.
+    if name.startswith('__'):
+        raise AttributeError('module %r has no attribute %r' % (__name__, name))
+    import selenium.webdriver
+    try:
+        return getattr(selenium.webdriver, name)
+    except AttributeError:
+        raise AttributeError('module %r has no attribute %r' % (__name__, name)) from None
\ No newline at end of file